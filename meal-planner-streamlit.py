@@ -1,5 +1,7 @@
 import streamlit as st
 import json
+import sys
+from collections import defaultdict
 from typing import List, Dict, Optional
 import random
 
@@ -12,32 +14,38 @@ if 'locked_dinners' not in st.session_state:
     st.session_state.locked_dinners = {}
 
 class MealPlanner:
-    def __init__(self, recipes_file: str):
-        try:
-            with open(recipes_file, 'r') as f:
-                self.recipes = json.load(f)
-            
-            # Validate recipe data
-            for recipe in self.recipes:
-                if 'name' not in recipe or 'category' not in recipe:
-                    raise ValueError("Recipe missing required fields")
-            
-            self.lunch_recipes = [r for r in self.recipes if r['name'].startswith('Lunch - ')]
-            self.dinner_recipes = [r for r in self.recipes if not r['name'].startswith('Lunch - ')]
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            st.error(f"Error loading recipes: {str(e)}")
-            self.recipes = []
-            self.lunch_recipes = []
-            self.dinner_recipes = []
+    def __init__(self, recipes: List[Dict]):
+        # Validate, split lunch/dinner and index by category in a single pass
+        self.lunch_recipes, self.dinner_recipes = [], []
+        self.lunch_by_cat = defaultdict(list)
+        self.dinner_by_cat = defaultdict(list)
+        for r in recipes:
+            if 'name' not in r or 'category' not in r or not isinstance(r['category'], str):
+                raise ValueError("Recipe missing required fields")
+            r['category'] = sys.intern(r['category'])
+            # Older recipe files have no meal_type; fall back to the name prefix once here
+            meal_type = r.get('meal_type')
+            if meal_type is None:
+                meal_type = r['meal_type'] = 'lunch' if r['name'].startswith('Lunch - ') else 'dinner'
+            elif meal_type not in ('lunch', 'dinner'):
+                raise ValueError(f"Recipe {r['name']!r} has invalid meal_type: {meal_type!r}")
+            if meal_type == 'lunch':
+                self.lunch_recipes.append(r)
+                self.lunch_by_cat[r['category']].append(r)
+            else:
+                self.dinner_recipes.append(r)
+                self.dinner_by_cat[r['category']].append(r)
+        
+        # Categories never change after load
+        self._cats = {'lunch': sorted(self.lunch_by_cat), 'dinner': sorted(self.dinner_by_cat)}
     
     def get_categories(self, meal_type: str = 'dinner') -> List[str]:
-        recipes = self.lunch_recipes if meal_type == 'lunch' else self.dinner_recipes
-        return sorted(set(r['category'] for r in recipes))
+        return self._cats['lunch' if meal_type == 'lunch' else 'dinner']
     
     def generate_lunch(self, category: Optional[str] = None) -> Dict:
         available = self.lunch_recipes
         if category:
-            available = [r for r in available if r['category'] == category]
+            available = self.lunch_by_cat.get(category)
             if not available:
                 st.error(f"No lunch recipes found for category: {category}")
                 return None
@@ -49,33 +57,51 @@ class MealPlanner:
     def generate_dinners(self, category_limits: Dict[str, int]) -> List[Dict]:
         new_dinners = [None] * 5
         
-        # First, keep all locked dinners
-        locked_indices = [i for i in range(5) if i in st.session_state.locked_dinners]
-        for idx in locked_indices:
-            new_dinners[idx] = st.session_state.locked_dinners[idx]
-            cat = new_dinners[idx]['category']
+        # First, keep all locked dinners and note which slots still need filling
+        locked = st.session_state.locked_dinners
+        locked_names = set()
+        empty_indices = []
+        for idx in range(5):
+            dinner = locked.get(idx)
+            if dinner is None:
+                empty_indices.append(idx)
+                continue
+            new_dinners[idx] = dinner
+            locked_names.add(dinner['name'])
+            cat = dinner['category']
             if cat in category_limits:
                 category_limits[cat] -= 1
         
+        # Draw each category's quota in one go; buckets are disjoint, so only locked dinners need excluding
+        picks = []
+        for category, limit in category_limits.items():
+            if limit > 0:
+                bucket = [r for r in self.dinner_by_cat.get(category, []) if r['name'] not in locked_names]
+                picks.extend(random.sample(bucket, k=min(limit, len(bucket))))
+        random.shuffle(picks)
+        
         # Fill remaining slots
-        empty_indices = [i for i in range(5) if new_dinners[i] is None]
-        for idx in empty_indices:
-            available_categories = [cat for cat, limit in category_limits.items() if limit > 0]
-            if available_categories:
-                category = random.choice(available_categories)
-                available = [r for r in self.dinner_recipes 
-                           if r['category'] == category and r not in new_dinners]
-                if available:
-                    new_dinners[idx] = random.choice(available)
-                    category_limits[category] -= 1
+        for idx, dinner in zip(empty_indices, picks):
+            new_dinners[idx] = dinner
         
         st.session_state.selected_dinners = new_dinners
         return new_dinners
 
+@st.cache_resource
+def _load_planner(path: str) -> MealPlanner:
+    # Streamlit reruns the whole script on every interaction; parse recipes once per process.
+    # Load errors propagate so a failed load is never cached.
+    with open(path, 'r') as f:
+        return MealPlanner(json.load(f))
+
 def main():
     st.title("Meal Planner")
     
-    planner = MealPlanner('recipes.json')
+    try:
+        planner = _load_planner('recipes.json')
+    except (FileNotFoundError, json.JSONDecodeError, ValueError) as e:
+        st.error(f"Error loading recipes: {str(e)}")
+        planner = MealPlanner([])
     
     # Lunch Section
     st.header("Lunch Generator")
@@ -94,9 +120,10 @@ def main():
             planner.generate_lunch()
     
     # Display selected lunch
-    if st.session_state.selected_lunch:
-        st.write("Selected Lunch:", st.session_state.selected_lunch['name'])
-        st.write("Category:", st.session_state.selected_lunch['category'])
+    lunch = st.session_state.selected_lunch
+    if lunch:
+        st.write("Selected Lunch:", lunch['name'])
+        st.write("Category:", lunch['category'])
     
     # Dinner Section
     st.header("Dinner Generator")
@@ -120,40 +147,43 @@ def main():
                 category_counts[category] = count
     
     # Lock dinners
-    if st.session_state.selected_dinners:
+    locked = st.session_state.locked_dinners
+    dinners = st.session_state.selected_dinners
+    if dinners:
         st.subheader("Lock Dinners")
         
         # Update locked dinners based on checkboxes
-        for i, dinner in enumerate(st.session_state.selected_dinners):
+        for i, dinner in enumerate(dinners):
             if dinner:
                 key = f"lock_dinner_{i}"
                 is_locked = st.checkbox(
                     f"Lock {dinner['name']}", 
                     key=key,
-                    value=(i in st.session_state.locked_dinners)
+                    value=(i in locked)
                 )
                 
                 if is_locked:
-                    st.session_state.locked_dinners[i] = dinner
-                elif i in st.session_state.locked_dinners:
-                    del st.session_state.locked_dinners[i]
+                    locked[i] = dinner
+                else:
+                    locked.pop(i, None)
     
     # Generate dinners button
     if st.button("Generate Dinners"):
         total_selected = sum(category_counts.values())
-        remaining_slots = 5 - len(st.session_state.locked_dinners)
+        remaining_slots = 5 - len(locked)
         
         if total_selected != remaining_slots:
             st.error(f"Please select exactly {remaining_slots} meals total (selected: {total_selected})")
         else:
-            planner.generate_dinners(category_counts)
+            dinners = planner.generate_dinners(category_counts)
     
     # Display selected dinners
-    if st.session_state.selected_dinners:
+    if dinners:
         st.subheader("Selected Dinners")
-        for i, dinner in enumerate(st.session_state.selected_dinners, 1):
+        locked_set = locked.keys()
+        for i, dinner in enumerate(dinners, 1):
             if dinner:
-                locked_status = "(Locked)" if (i-1) in st.session_state.locked_dinners else ""
+                locked_status = "(Locked)" if (i-1) in locked_set else ""
                 st.write(f"{i}. {dinner['name']} ({dinner['category']}) {locked_status}")
 
 if __name__ == "__main__":